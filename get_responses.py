@@ -4,6 +4,7 @@ Query the hackmud responses log
 """
 
 import sys
+import os
 import json
 import re
 from pathlib import Path
@@ -12,15 +13,67 @@ from datetime import datetime
 SCRIPT_DIR = Path(__file__).parent.resolve()
 LOG_FILE = SCRIPT_DIR / "responses.log"
 
-def parse_log():
-    """Parse the responses log into structured entries"""
-    if not LOG_FILE.exists():
-        return []
+# Every entry starts with this (see mem_scanner.format_log_entry)
+ENTRY_MARKER = b'\n--- '
+TAIL_BLOCK_SIZE = 64 * 1024
 
-    entries = []
+def log_segments():
+    """Existing log files, oldest first: rotated responses.log.N .. .1, then responses.log"""
+    rotated = [p for p in LOG_FILE.parent.glob(LOG_FILE.name + '.*') if p.suffix[1:].isdigit()]
+    rotated.sort(key=lambda p: int(p.suffix[1:]), reverse=True)
+    if LOG_FILE.exists():
+        rotated.append(LOG_FILE)
+    return rotated
 
-    with open(LOG_FILE, 'r') as f:
-        content = f.read()
+def parse_log():
+    """Parse the responses log (including rotated segments) into structured entries"""
+    content = []
+    for path in log_segments():
+        with open(path, 'r') as f:
+            content.append(f.read())
+
+    return parse_entries(''.join(content))
+
+def iter_log_tail(n):
+    """Read just enough of the end of the log to hold the last n entries,
+    then more on demand.
+
+    Reads backwards in TAIL_BLOCK_SIZE blocks until more than n entry
+    markers have been seen, so the cost is bounded by n rather than by the
+    size of the log. Each further item continues from where the previous
+    one stopped, doubling n.
+
+    Yields:
+        tuple: (text, reached_start) - reached_start is True when the whole
+        file was read (always the last item)
+    """
+    with open(LOG_FILE, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END)
+        blocks = []  # Newest first
+        markers = 0
+        while True:
+            while pos > 0 and markers <= n:
+                step = min(TAIL_BLOCK_SIZE, pos)
+                pos -= step
+                f.seek(pos)
+                block = f.read(step)
+                # Include the start of the following block so a marker split
+                # across the boundary is counted (once, with this block)
+                following = blocks[-1][:len(ENTRY_MARKER) - 1] if blocks else b''
+                markers += (block + following).count(ENTRY_MARKER)
+                blocks.append(block)
+
+            # A block boundary may split a UTF-8 sequence, but only inside the
+            # leading partial entry that parse_entries() discards anyway
+            data = b''.join(reversed(blocks))
+            yield data.decode('utf-8', errors='ignore').replace('\r\n', '\n'), pos == 0
+            if pos == 0:
+                return
+            n *= 2
+
+def parse_entries(content):
+    """Parse responses log text into structured entries"""
+    entries = []
 
     # Split by entry markers (format: --- timestamp [addr] [type] ---)
     # type can be: json, game_output, trust_message, text
@@ -65,12 +118,25 @@ def parse_log():
 
 def get_latest(n=5, script_filter=None):
     """Get the latest n responses, optionally filtered by script name"""
-    entries = parse_log()
-
     if script_filter:
+        entries = parse_log()
         entries = [e for e in entries if e['parsed'].get('script_name', '').find(script_filter) != -1]
+        return entries[-n:]
 
-    return entries[-n:]
+    if not LOG_FILE.exists():
+        return parse_log()[-n:]
+
+    # Unfiltered: only parse the tail of the log. Entries that fail to parse
+    # are dropped, so widen the window until we have n of them.
+    for content, reached_start in iter_log_tail(n):
+        entries = parse_entries(content)
+        if len(entries) >= n:
+            return entries[-n:]
+        if reached_start:
+            # Not enough in the live log - fall back to including rotated segments
+            if len(log_segments()) > 1:
+                return parse_log()[-n:]
+            return entries[-n:]
 
 def get_since(timestamp_str):
     """Get all responses since a timestamp (format: YYYY-MM-DD HH:MM:SS or HH:MM:SS)"""
@@ -121,7 +187,7 @@ def main():
                                 try:
                                     data = json.loads(data)
                                     print(json.dumps(data, indent=2)[:500])
-                                except:
+                                except json.JSONDecodeError:
                                     print(data[:500])
                             else:
                                 print(json.dumps(e['parsed'], indent=2)[:500])
@@ -157,7 +223,7 @@ def main():
                     try:
                         data = json.loads(data)
                         print(json.dumps(data, indent=2)[:1000])
-                    except:
+                    except json.JSONDecodeError:
                         print(data[:1000])
                 else:
                     print(json.dumps(e['parsed'], indent=2)[:1000])
@@ -8,16 +8,53 @@ import sys
 import os
 import time
 import json
+import ctypes
+import errno
+import fcntl
+import struct
 import hashlib
+from collections import OrderedDict
 from pathlib import Path
 
 SCRIPT_DIR = Path(__file__).parent.resolve()
 OUTPUT_FILE = SCRIPT_DIR / "responses.log"
 INBOX_FILE = SCRIPT_DIR / "inbox.log"
 
+# responses.log is rotated to responses.log.1 .. .N once it grows past this
+MAX_LOG_BYTES = 16 * 1024 * 1024
+LOG_BACKUPS = 3
+
+# Content hashes remembered across watch passes (see SeenHashes). Hashes seen
+# in the current pass are never evicted, so this is exceeded (with a warning)
+# when a single pass turns up more distinct content than this
+MAX_SEEN_HASHES = 100000
+
+# Watch mode scans every WATCH_INTERVAL seconds while responses are coming
+# in, backing off by doubling up to WATCH_MAX_INTERVAL while nothing is new
+WATCH_INTERVAL = 0.5
+WATCH_MAX_INTERVAL = 2.0
+
 # My username - messages mentioning this or DMs to me are important
 MY_USERNAME = "claudeb0t"
 
+# Search terms that indicate game output
+GAME_OUTPUT_TERMS = [
+    b'<color=#',           # Unity color-coded output
+    b':::TRUST',           # Trust messages
+    b'scripts.',           # Script references
+    b'marks.',             # Marks references
+    b'`N',                 # Hackmud blue color code
+    b'`C',                 # Hackmud cyan color code
+    b'`0',                 # Hackmud gray color code
+    b'`L',                 # Hackmud lime color code
+]
+
+def compile_search_terms(terms):
+    """Compile literal byte terms into one alternation so a region is searched once, not once per term"""
+    return re.compile(b'|'.join(re.escape(term) for term in terms))
+
+GAME_OUTPUT_TERMS_RE = compile_search_terms(GAME_OUTPUT_TERMS)
+
 def get_pid_by_name(name):
     """Find PID of process by name"""
     for pid in os.listdir('/proc'):
@@ -26,46 +63,369 @@ def get_pid_by_name(name):
                 with open(f'/proc/{pid}/comm', 'r') as f:
                     if name in f.read():
                         return int(pid)
-            except (IOError, FileNotFoundError):
+            except OSError:
                 pass
     return None
 
-def get_memory_regions(pid, include_all_rw=False):
-    """Get readable memory regions from /proc/[pid]/maps"""
+# start-end perms offset dev inode [path]
+MAPS_LINE_RE = re.compile(rb'^([0-9a-f]+)-([0-9a-f]+) (\S+) \S+ \S+ \S+ *(.*)$', re.MULTILINE)
+
+# struct procmap_query from <linux/fs.h> (Linux 6.11+)
+PROCMAP_QUERY_FMT = '<9Q4I2Q'
+PROCMAP_QUERY_SIZE = struct.calcsize(PROCMAP_QUERY_FMT)
+# _IOWR('f', 17, struct procmap_query)
+PROCMAP_QUERY = (3 << 30) | (PROCMAP_QUERY_SIZE << 16) | (ord('f') << 8) | 17
+PROCMAP_QUERY_VMA_READABLE = 0x01
+PROCMAP_QUERY_VMA_WRITABLE = 0x02
+PROCMAP_QUERY_VMA_EXECUTABLE = 0x04
+PROCMAP_QUERY_VMA_SHARED = 0x08
+PROCMAP_QUERY_COVERING_OR_NEXT_VMA = 0x10
+
+def _query_rw_maps(fd):
+    """Walk the rw VMAs of an open /proc/[pid]/maps fd with the PROCMAP_QUERY ioctl"""
+    name = ctypes.create_string_buffer(4096)
+    flags = (PROCMAP_QUERY_COVERING_OR_NEXT_VMA |
+             PROCMAP_QUERY_VMA_READABLE | PROCMAP_QUERY_VMA_WRITABLE)
+    maps = []
+    addr = 0
+    while True:
+        query = bytearray(struct.pack(PROCMAP_QUERY_FMT, PROCMAP_QUERY_SIZE, flags, addr,
+                                      0, 0, 0, 0, 0, 0, 0, 0, len(name), 0,
+                                      ctypes.addressof(name), 0))
+        try:
+            fcntl.ioctl(fd, PROCMAP_QUERY, query)
+        except OSError as e:
+            if e.errno == errno.ENOENT:  # No more matching VMAs
+                break
+            raise
+
+        fields = struct.unpack(PROCMAP_QUERY_FMT, query)
+        start, end, vma_flags, name_size = fields[3], fields[4], fields[5], fields[11]
+        perms = bytes((
+            ord('r') if vma_flags & PROCMAP_QUERY_VMA_READABLE else ord('-'),
+            ord('w') if vma_flags & PROCMAP_QUERY_VMA_WRITABLE else ord('-'),
+            ord('x') if vma_flags & PROCMAP_QUERY_VMA_EXECUTABLE else ord('-'),
+            ord('s') if vma_flags & PROCMAP_QUERY_VMA_SHARED else ord('p'),
+        ))
+        maps.append((start, end, perms, name.value if name_size else b''))
+        addr = end
+    return maps
+
+def open_maps(pid):
+    """Open the maps file of pid's main thread.
+
+    /proc/[pid]/task/[pid]/maps lists the same mappings as /proc/[pid]/maps,
+    but older kernels annotate thread stacks in the latter by walking every
+    thread, which is slow on a heavily threaded process like the game.
+    """
+    try:
+        return open(f'/proc/{pid}/task/{pid}/maps', 'rb')
+    except FileNotFoundError:
+        return open(f'/proc/{pid}/maps', 'rb')
+
+def read_maps(pid):
+    """Get the rw mappings of pid as (start, end, perms, path) tuples.
+
+    On Linux 6.11+ the PROCMAP_QUERY ioctl hands back just the rw VMAs as
+    binary structs; older kernels fall back to reading /proc/[pid]/maps in
+    one go and parsing the text.
+    """
+    with open_maps(pid) as f:
+        try:
+            return _query_rw_maps(f.fileno())
+        except OSError as e:
+            if e.errno not in (errno.ENOTTY, errno.EINVAL):
+                raise
+        data = f.read()
+
+    return [(int(start, 16), int(end, 16), perms, path)
+            for start, end, perms, path in MAPS_LINE_RE.findall(data)
+            if b'rw' in perms]
+
+def is_library_path(path):
+    """Check if a mapping's path is a shared library (.so, .so.N or .dll)"""
+    name = path.rsplit(b'/', 1)[-1]
+    return name.endswith((b'.so', b'.dll')) or b'.so.' in name
+
+def get_memory_regions(pid, include_all_rw=False, maps=None):
+    """Get readable memory regions from /proc/[pid]/maps
+
+    Pass maps (from read_maps) to filter an already-parsed maps list instead
+    of reading the file again.
+    """
+    if maps is None:
+        maps = read_maps(pid)
+
     regions = []
-    with open(f'/proc/{pid}/maps', 'r') as f:
-        for line in f:
-            parts = line.split()
-            if len(parts) >= 2 and 'rw' in parts[1]:  # readable+writable
-                addr_range = parts[0].split('-')
-                start = int(addr_range[0], 16)
-                end = int(addr_range[1], 16)
-
-                if include_all_rw:
-                    # Include all rw regions for game output scanning
+    for start, end, perms, path in maps:
+        if b'rw' in perms:  # readable+writable
+            if include_all_rw:
+                # Include all rw regions for game output scanning, except the
+                # data sections of shared libraries (native globals, not game text)
+                if not is_library_path(path):
                     regions.append((start, end))
-                else:
-                    # Only scan anonymous rw regions (where managed heap lives)
-                    if len(parts) == 5 or (len(parts) >= 6 and parts[5] == ''):
-                        regions.append((start, end))
+            elif not path:
+                # Only scan anonymous rw regions (where managed heap lives)
+                regions.append((start, end))
     return regions
 
+# /proc/[pid] files held open across watch passes: (pid, name) -> file
+_proc_files = {}
+
+def proc_file(pid, name):
+    """Return /proc/[pid]/name opened once and kept for later passes.
+
+    Only for files read positionally (mem, pagemap): pread needs no seek,
+    so a single unbuffered fd serves every read for the life of the process.
+    """
+    f = _proc_files.get((pid, name))
+    if f is None:
+        f = open(f'/proc/{pid}/{name}', 'rb', buffering=0)
+        _proc_files[pid, name] = f
+    return f
+
+def close_proc_files():
+    """Close every file opened by proc_file"""
+    for f in _proc_files.values():
+        f.close()
+    _proc_files.clear()
+
+# Stop reading once a scan pass has covered this many bytes; regions that no
+# longer fit are skipped
+SCAN_BYTE_BUDGET = 2 * 1024 * 1024 * 1024
+
+# process_vm_readv batching: at most IOV_MAX regions / READV_BATCH_BYTES per syscall
+IOV_MAX = 1024
+READV_BATCH_BYTES = 64 * 1024 * 1024
+
+class IOVec(ctypes.Structure):
+    """struct iovec"""
+    _fields_ = [('iov_base', ctypes.c_void_p), ('iov_len', ctypes.c_size_t)]
+
+try:
+    _process_vm_readv = ctypes.CDLL(None, use_errno=True).process_vm_readv
+    _process_vm_readv.argtypes = [ctypes.c_int, ctypes.POINTER(IOVec), ctypes.c_ulong,
+                                  ctypes.POINTER(IOVec), ctypes.c_ulong, ctypes.c_ulong]
+    _process_vm_readv.restype = ctypes.c_ssize_t
+except (OSError, AttributeError):
+    _process_vm_readv = None
+
+def _readv_batch(pid, batch):
+    """Read a batch of (start, size) regions with a single process_vm_readv call.
+
+    The kernel stops at the first remote region it cannot read, so the
+    returned list of bytearrays may cover only a prefix of the batch (and
+    its last entry may be short).
+    """
+    bufs = [bytearray(size) for start, size in batch]
+    local = (IOVec * len(bufs))(*[
+        IOVec(ctypes.addressof((ctypes.c_char * len(buf)).from_buffer(buf)), len(buf))
+        for buf in bufs
+    ])
+    remote = (IOVec * len(batch))(*[IOVec(start, size) for start, size in batch])
+
+    got = _process_vm_readv(pid, local, len(bufs), remote, len(batch), 0)
+    if got < 0:
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err))
+
+    result = []
+    for buf in bufs:
+        if got <= 0:
+            break
+        if got < len(buf):
+            del buf[got:]
+        result.append(buf)
+        got -= len(buf)
+    return result
+
+def _read_regions_pread(pid, wanted):
+    """Fallback for read_regions: one pread per region"""
+    mem = proc_file(pid, 'mem')
+    for start, size in wanted:
+        try:
+            data = os.pread(mem.fileno(), size, start)
+        except OSError:
+            continue
+        if data:
+            yield start, data
+
+def read_regions(pid, regions, max_size=None):
+    """Yield (start, data) for every readable region (no larger than max_size, if given).
+
+    Regions are fetched with process_vm_readv, up to IOV_MAX regions per
+    syscall, falling back to a pread per region if the syscall is not
+    available. Unreadable regions are skipped, and reading stops if the
+    process exits.
+    """
+    wanted = [(start, end - start) for start, end in regions
+              if max_size is None or end - start <= max_size]
+    if _process_vm_readv is None:
+        yield from _read_regions_pread(pid, wanted)
+        return
+
+    i = 0
+    batch_max = IOV_MAX
+    while i < len(wanted):
+        batch = [wanted[i]]
+        total = wanted[i][1]
+        for start, size in wanted[i + 1:i + batch_max]:
+            if total + size > READV_BATCH_BYTES:
+                break
+            batch.append((start, size))
+            total += size
+
+        try:
+            bufs = _readv_batch(pid, batch)
+        except OSError as e:
+            if e.errno in (errno.ENOSYS, errno.EPERM):
+                yield from _read_regions_pread(pid, wanted[i:])
+                return
+            if e.errno == errno.ESRCH:
+                return  # Process exited
+            # First region of the batch is unreadable. Go one region at a
+            # time until something reads again, rather than allocating a
+            # full batch of buffers for every region in an unreadable run.
+            bufs = []
+            batch_max = 1
+        else:
+            batch_max = IOV_MAX
+
+        for (start, size), buf in zip(batch, bufs):
+            yield start, buf
+
+        # Resume after what was read, skipping the region that stopped the batch
+        done = len(bufs)
+        if done < len(batch) and (not bufs or len(bufs[-1]) == batch[done - 1][1]):
+            done += 1
+        i += done
+
+# pagemap holds one u64 per page; bit 63 = present in RAM, bit 62 = swapped out
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+PAGEMAP_IN_USE = (1 << 63) | (1 << 62)
+
+def _present_runs(pagemap, start, end):
+    """Split [start, end) into runs of pages that are present or swapped"""
+    first = start // PAGE_SIZE
+    raw = os.pread(pagemap.fileno(), (end - start) // PAGE_SIZE * 8, first * 8)
+    entries = memoryview(raw)[:len(raw) // 8 * 8].cast('Q')
+
+    runs = []
+    run_start = None
+    for i, entry in enumerate(entries):
+        if entry & PAGEMAP_IN_USE:
+            if run_start is None:
+                run_start = (first + i) * PAGE_SIZE
+        elif run_start is not None:
+            runs.append((run_start, (first + i) * PAGE_SIZE))
+            run_start = None
+    if run_start is not None:
+        runs.append((run_start, (first + len(entries)) * PAGE_SIZE))
+    return runs
+
+def populated_runs(pid, regions):
+    """Narrow anonymous regions down to the pages the process has touched.
+
+    Untouched anonymous pages are not backed by anything and read back as
+    zeros, so large, sparsely used heaps can be scanned without reading
+    them. Regions are kept whole if /proc/[pid]/pagemap is unreadable.
+
+    Returns:
+        dict: (start, end) region -> list of (start, end) runs
+    """
+    try:
+        pagemap = proc_file(pid, 'pagemap')
+    except OSError:
+        return {region: [region] for region in regions}
+
+    runs = {}
+    for start, end in regions:
+        try:
+            runs[start, end] = _present_runs(pagemap, start, end)
+        except OSError:
+            runs[start, end] = [(start, end)]
+    return runs
+
+# Regions larger than SCAN_WINDOW_SIZE are read and scanned one window at a
+# time. Each window is read with enough bytes around it that extraction near
+# its edges sees the same data it would in the whole region: more than the
+# 500 byte backward searches before, more than extract_json's 100000 byte
+# limit after.
+SCAN_WINDOW_SIZE = 4 * 1024 * 1024
+SCAN_CONTEXT_BEFORE = 4096
+SCAN_CONTEXT_AFTER = 128 * 1024
+
+def read_windows(pid, regions, budget=SCAN_BYTE_BUDGET):
+    """Yield (region_start, base, data, lo, hi) for every readable region.
+
+    data was read from address base, and only matches starting in
+    data[lo:hi] belong to it; the rest is context shared with neighbouring
+    windows. Regions up to SCAN_WINDOW_SIZE come whole (lo=0, hi=None) and
+    are batched through read_regions. Regions of any size are read, in maps
+    order, until they add up to budget bytes.
+
+    Windows are preadv'd into one reused buffer, so a windowed region's data
+    is only valid until the next item is requested.
+    """
+    scratch = bytearray()
+    small = []
+    for start, end in regions:
+        size = end - start
+        if size > budget:
+            continue
+        budget -= size
+
+        if size <= SCAN_WINDOW_SIZE:
+            small.append((start, end))
+            continue
+
+        for region_start, data in read_regions(pid, small):
+            yield region_start, region_start, data, 0, None
+        small = []
+
+        mem = proc_file(pid, 'mem')
+        for off in range(start, end, SCAN_WINDOW_SIZE):
+            base = max(start, off - SCAN_CONTEXT_BEFORE)
+            stop = min(end, off + SCAN_WINDOW_SIZE + SCAN_CONTEXT_AFTER)
+            if len(scratch) != stop - base:
+                scratch = bytearray(stop - base)
+            try:
+                got = os.preadv(mem.fileno(), [scratch], base)
+            except OSError:
+                continue
+            if got < len(scratch):
+                del scratch[got:]  # Short read: stopped at an unreadable page
+            if got:
+                yield start, base, scratch, off - base, off + SCAN_WINDOW_SIZE - base
+
+    for region_start, data in read_regions(pid, small):
+        yield region_start, region_start, data, 0, None
+
+def _matches(pattern, data, lo, hi):
+    """pattern.finditer over data, limited to matches starting in data[lo:hi]"""
+    for match in pattern.finditer(data, lo):
+        if hi is not None and match.start() >= hi:
+            break
+        yield match
+
+# The only bytes that affect JSON structure; everything else is skipped
+JSON_TOKEN_RE = re.compile(rb'[{}"\\]')
+LINE_END_RE = re.compile(rb'[\n\x00\r]')
+
 def extract_json(data, pos):
     """Extract a complete JSON object starting at pos"""
     depth = 0
-    json_end = pos
     in_string = False
-    escape_next = False
-
-    for i in range(pos, min(pos + 100000, len(data))):
-        byte = data[i:i+1]
+    escaped = -1  # Index of the byte following a backslash
 
-        if escape_next:
-            escape_next = False
+    for match in JSON_TOKEN_RE.finditer(data, pos, min(pos + 100000, len(data))):
+        i = match.start()
+        if i == escaped:
             continue
 
+        byte = match.group()
         if byte == b'\\':
-            escape_next = True
+            escaped = i + 1
             continue
 
         if byte == b'"':
@@ -77,7 +437,7 @@ def extract_json(data, pos):
 
         if byte == b'{':
             depth += 1
-        elif byte == b'}':
+        else:
             depth -= 1
             if depth == 0:
                 return data[pos:i+1]
@@ -88,17 +448,17 @@ def extract_text_line(data, pos):
     """Extract a text line/message starting at or around pos"""
     # Find start of line (look backwards for newline or null)
     start = pos
-    for i in range(pos, max(0, pos - 200), -1):
-        if data[i:i+1] in (b'\n', b'\x00', b'\r'):
-            start = i + 1
-            break
+    floor = max(0, pos - 200) + 1
+    last = max(data.rfind(b'\n', floor, pos + 1), data.rfind(b'\x00', floor, pos + 1),
+               data.rfind(b'\r', floor, pos + 1))
+    if last != -1:
+        start = last + 1
 
     # Find end of line (look forwards for newline or null)
     end = pos
-    for i in range(pos, min(len(data), pos + 500)):
-        if data[i:i+1] in (b'\n', b'\x00', b'\r'):
-            end = i
-            break
+    match = LINE_END_RE.search(data, pos, min(len(data), pos + 500))
+    if match:
+        end = match.start()
 
     if end > start:
         return data[start:end]
@@ -136,11 +496,14 @@ def extract_game_output(data, pos):
         return data[start:end]
     return None
 
+COLOR_OPEN_RE = re.compile(r'<color=#[0-9A-Fa-f]+>')
+COLOR_CLOSE_RE = re.compile(r'</color>')
+
 def strip_color_codes(text):
     """Remove Unity color tags from text"""
     # Remove <color=#XXXXXXXX>...</color> tags
-    result = re.sub(r'<color=#[0-9A-Fa-f]+>', '', text)
-    result = re.sub(r'</color>', '', result)
+    result = COLOR_OPEN_RE.sub('', text)
+    result = COLOR_CLOSE_RE.sub('', result)
     return result
 
 def is_important_message(parsed_data):
@@ -195,282 +558,394 @@ def save_to_inbox(message, timestamp=None):
     print(f"📬 IMPORTANT: {message}")
     print(f"{'='*60}\n")
 
+def rotate_log(path, max_bytes=MAX_LOG_BYTES, backups=LOG_BACKUPS):
+    """Rotate path to path.1 (shifting older segments up to path.N) once it exceeds max_bytes"""
+    try:
+        if path.stat().st_size <= max_bytes:
+            return
+    except FileNotFoundError:
+        return
+
+    for i in range(backups - 1, 0, -1):
+        older = path.with_name(f'{path.name}.{i}')
+        if older.exists():
+            older.replace(path.with_name(f'{path.name}.{i + 1}'))
+    path.replace(path.with_name(f'{path.name}.1'))
+
+def format_log_entry(r, timestamp):
+    """Format a scan result as a responses.log entry"""
+    msg_type = r.get('type', 'json')
+    parts = [f"\n--- {timestamp} [{r['addr']}] [{msg_type}] ---\n"]
+    if msg_type in ('game_output', 'trust_message', 'text', 'backtick_colored'):
+        # Write raw output first (preserves color codes), then cleaned text
+        raw_output = r.get('raw', '')
+        if raw_output and raw_output != r.get('text', ''):
+            parts.append("=== RAW (with colors) ===\n")
+            parts.append(raw_output)
+            parts.append("\n=== CLEANED ===\n")
+        parts.append(r.get('text', ''))
+    else:
+        parts.append(r.get('json', ''))
+    parts.append("\n")
+    return ''.join(parts)
+
+# Starts of the game output blocks extract_game_output_blocks extracts
+PROMPT_COLOR_RE = re.compile(rb'>><color=#[0-9A-Fa-f]+>')    # >> prompt with color code
+TRUST_MESSAGE_RE = re.compile(rb':::TRUST COMMUNICATION:::')  # Trust messages without >> prefix
+BACKTICK_COLOR_RE = re.compile(rb'`[A-Za-z0-9][A-Za-z0-9_]+')  # Hackmud backtick color code
+CONTROL_BYTE_RE = re.compile(rb'[\x00-\x08\x0b\x0c\x0e-\x1f]')  # Control chars but tab/newline/CR
+
+def scan_data_for_game_output(data, start, seen_hashes, found, terms_re=None, lo=0, hi=None):
+    """Scan one region's data for game output, appending results to found.
+
+    Only matches starting in data[lo:hi] are considered (see read_windows).
+    """
+    if terms_re is None:
+        terms_re = GAME_OUTPUT_TERMS_RE
+
+    # Check if this region has any of our search terms (one pass for all terms)
+    if not terms_re.search(data):
+        return
+
+    extract_game_output_blocks(data, start, seen_hashes, found, lo, hi)
+
+def extract_game_output_blocks(data, start, seen_hashes, found, lo=0, hi=None):
+    """Extract game output blocks from data without checking for search terms"""
+    # Look for >> prompts (command output) with color codes
+    # Pattern: >><color=...> or just >>
+    for match in _matches(PROMPT_COLOR_RE, data, lo, hi):
+        pos = match.start()
+
+        # Extract until next >> prompt or reasonable limit
+        end_pos = pos + 4000
+        next_prompt = data.find(b'\n>>', pos + 2)
+        if next_prompt != -1 and next_prompt < end_pos:
+            end_pos = next_prompt
+
+        output_bytes = data[pos:end_pos]
+
+        if output_bytes and len(output_bytes) > 20:
+            h = hashlib.md5(output_bytes).hexdigest()
+            if h in seen_hashes:
+                continue
+            seen_hashes.add(h)
+
+            output_str = output_bytes.decode('utf-8', errors='ignore')
+            clean_output = strip_color_codes(output_str)
+            clean_output = ''.join(c for c in clean_output if c.isprintable() or c in '\n\r\t')
+
+            if len(clean_output.strip()) > 10:
+                found.append({
+                    'addr': hex(start + pos),
+                    'raw': output_str,
+                    'text': clean_output,
+                    'type': 'game_output'
+                })
+
+    # Also look for TRUST messages that might not have >> prefix
+    # Match :::TRUST COMMUNICATION::: followed by any printable chars until we hit junk
+    for match in _matches(TRUST_MESSAGE_RE, data, lo, hi):
+        pos = match.start()
+        # Extract from the ::: to the end of the message (look for null, newline, or non-printable)
+        # Stop at null byte or control chars (except common ones)
+        limit = min(len(data), pos + 500)
+        junk = CONTROL_BYTE_RE.search(data, pos, limit)
+        end_pos = junk.start() if junk else limit
+
+        output_bytes = data[pos:end_pos]
+
+        if len(output_bytes) < 30:  # Too short, skip
+            continue
+
+        h = hashlib.md5(output_bytes).hexdigest()
+        if h in seen_hashes:
+            continue
+        seen_hashes.add(h)
+
+        output_str = output_bytes.decode('utf-8', errors='ignore')
+        clean_output = strip_color_codes(output_str)
+        clean_output = ''.join(c for c in clean_output if c.isprintable() or c in '\n\r\t')
+        clean_output = clean_output.strip()
+
+        if len(clean_output) > 20:
+            found.append({
+                'addr': hex(start + pos),
+                'raw': output_str,
+                'text': clean_output,
+                'type': 'trust_message'
+            })
+
+    # Look for text with hackmud backtick color codes (e.g. `N for blue)
+    # Pattern: backtick followed by letter/number (color code) followed by text
+    for match in _matches(BACKTICK_COLOR_RE, data, lo, hi):
+        pos = match.start()
+
+        # Look backwards to find start of this text block
+        block_start = pos
+        floor = max(0, pos - 100) + 1
+        last = max(data.rfind(b'\x00', floor, pos + 1), data.rfind(b'\n', floor, pos + 1))
+        if last != -1:
+            block_start = last + 1
+
+        # Look forward to find end
+        block_end = data.find(b'\x00', pos, min(len(data), pos + 2000))
+        if block_end == -1:
+            block_end = pos + 200
+
+        output_bytes = data[block_start:block_end]
+
+        # Must have multiple backtick codes to be interesting
+        if output_bytes.count(b'`') < 3:
+            continue
+
+        if len(output_bytes) < 30:
+            continue
+
+        h = hashlib.md5(output_bytes).hexdigest()
+        if h in seen_hashes:
+            continue
+        seen_hashes.add(h)
+
+        output_str = output_bytes.decode('utf-8', errors='ignore')
+        # Keep backticks in raw, but also make a version showing the color codes
+        clean_output = ''.join(c for c in output_str if c.isprintable() or c in '\n\r\t')
+        clean_output = clean_output.strip()
+
+        if len(clean_output) > 20:
+            found.append({
+                'addr': hex(start + block_start),
+                'raw': output_str,
+                'text': clean_output,
+                'type': 'backtick_colored'
+            })
+
+class GameOutputGate:
+    """Applies scan_data_for_game_output's search-term check per region when
+    regions are read in pieces (populated runs, windows).
+
+    Output is extracted from every piece of a region once any piece holds a
+    search term; pieces that went by before that are re-read at that point.
+    """
+
+    def __init__(self, pid, seen_hashes, found, terms_re=GAME_OUTPUT_TERMS_RE):
+        self.pid = pid
+        self.seen_hashes = seen_hashes
+        self.found = found
+        self.terms_re = terms_re
+        self.matched = set()
+        self.pending = {}
+
+    def scan(self, region, data, start, lo=0, hi=None):
+        """Scan one piece of region, read from address start"""
+        if region not in self.matched:
+            if not self.terms_re.search(data):
+                self.pending.setdefault(region, []).append((start, len(data), lo, hi))
+                return
+            self.matched.add(region)
+
+            mem = proc_file(self.pid, 'mem')
+            for p_start, p_size, p_lo, p_hi in self.pending.pop(region, ()):
+                try:
+                    p_data = os.pread(mem.fileno(), p_size, p_start)
+                except OSError:
+                    continue
+                extract_game_output_blocks(p_data, p_start, self.seen_hashes, self.found, p_lo, p_hi)
+
+        extract_game_output_blocks(data, start, self.seen_hashes, self.found, lo, hi)
+
 def scan_memory_for_game_output(pid, regions, seen_hashes, search_terms=None):
     """Scan all memory regions for game output by searching for content"""
     found = []
 
     # Default search terms that indicate game output
     if search_terms is None:
-        search_terms = [
-            b'<color=#',           # Unity color-coded output
-            b':::TRUST',           # Trust messages
-            b'scripts.',           # Script references
-            b'marks.',             # Marks references
-            b'`N',                 # Hackmud blue color code
-            b'`C',                 # Hackmud cyan color code
-            b'`0',                 # Hackmud gray color code
-            b'`L',                 # Hackmud lime color code
-        ]
-
-    mem_file = f'/proc/{pid}/mem'
-
-    with open(mem_file, 'rb') as mem:
-        for start, end in regions:
-            size = end - start
-            if size > 100 * 1024 * 1024:  # Skip regions > 100MB
+        terms_re = GAME_OUTPUT_TERMS_RE
+    else:
+        terms_re = compile_search_terms(search_terms)
+
+    # Search terms gate game output per region, not per window
+    gate = GameOutputGate(pid, seen_hashes, found, terms_re)
+    for region_start, start, data, lo, hi in read_windows(pid, regions):
+        gate.scan(region_start, data, start, lo, hi)
+
+    return found
+
+# Patterns for hackmud server responses
+JSON_PATTERNS = [
+    rb'"t":\d+,"script_name":"',  # Script response with timestamp
+    rb'\{"ok":',           # Standard API response
+    rb'\{"chats":',        # Chat messages
+    rb'\{"users":',        # User data
+    rb'\{"scripts":',      # Script listings
+    rb'\{"balance":',      # GC balance
+    rb'\{"hardline":',     # Hardline data
+    rb'\{"loc":',          # Location data
+    rb'\{"channels":',     # Channel data
+    rb'\{"msg":',          # Messages
+    rb'\{"sys":',          # System messages
+]
+
+# Plain text patterns for error/system messages
+TEXT_PATTERNS = [
+    rb':::TRUST COMMUNICATION:::',  # System/error messages
+]
+
+JSON_PATTERNS_RE = re.compile(rb'|'.join(JSON_PATTERNS))
+TEXT_PATTERNS_RE = re.compile(rb'|'.join(TEXT_PATTERNS))
+
+def scan_data_for_json(data, start, seen_hashes, found, lo=0, hi=None):
+    """Scan one region's data for JSON responses and text messages, appending results to found.
+
+    Only matches starting in data[lo:hi] are considered (see read_windows).
+    """
+    # Scan for JSON patterns
+    for match in _matches(JSON_PATTERNS_RE, data, lo, hi):
+        pos = match.start()
+
+        # For patterns that don't start with {, find the opening brace
+        if data[pos:pos+1] != b'{':
+            # Search backwards for the opening brace
+            brace = data.rfind(b'{', max(0, pos - 500) + 1, pos + 1)
+            if brace != -1:
+                pos = brace
+
+        json_bytes = extract_json(data, pos)
+
+        if json_bytes and len(json_bytes) > 30:
+            # Hash to avoid duplicates
+            h = hashlib.md5(json_bytes).hexdigest()
+            if h in seen_hashes:
                 continue
-            try:
-                mem.seek(start)
-                data = mem.read(size)
+            seen_hashes.add(h)
 
-                # Check if this region has any of our search terms
-                has_content = False
-                for term in search_terms:
-                    if term in data:
-                        has_content = True
-                        break
+            json_str = json_bytes.decode('utf-8', errors='ignore')
+            try:
+                # Validate it's actual JSON
+                parsed = json.loads(json_str)
+            except json.JSONDecodeError:
+                continue
 
-                if not has_content:
+            # Skip Unity analytics
+            if isinstance(parsed, dict):
+                if parsed.get('type', '').startswith('analytics.'):
+                    continue
+                if parsed.get('type', '').startswith('perf.'):
                     continue
 
-                # Look for >> prompts (command output) with color codes
-                # Pattern: >><color=...> or just >>
-                for match in re.finditer(rb'>><color=#[0-9A-Fa-f]+>', data):
-                    pos = match.start()
-
-                    # Extract until next >> prompt or reasonable limit
-                    end_pos = pos + 4000
-                    next_prompt = data.find(b'\n>>', pos + 2)
-                    if next_prompt != -1 and next_prompt < end_pos:
-                        end_pos = next_prompt
-
-                    output_bytes = data[pos:end_pos]
-
-                    if output_bytes and len(output_bytes) > 20:
-                        h = hashlib.md5(output_bytes).hexdigest()
-                        if h in seen_hashes:
-                            continue
-                        seen_hashes.add(h)
-
-                        try:
-                            output_str = output_bytes.decode('utf-8', errors='ignore')
-                            clean_output = strip_color_codes(output_str)
-                            clean_output = ''.join(c for c in clean_output if c.isprintable() or c in '\n\r\t')
-
-                            if len(clean_output.strip()) > 10:
-                                found.append({
-                                    'addr': hex(start + pos),
-                                    'raw': output_str,
-                                    'text': clean_output,
-                                    'type': 'game_output'
-                                })
-                        except UnicodeDecodeError:
-                            pass
-
-                # Also look for TRUST messages that might not have >> prefix
-                # Match :::TRUST COMMUNICATION::: followed by any printable chars until we hit junk
-                for match in re.finditer(rb':::TRUST COMMUNICATION:::', data):
-                    pos = match.start()
-                    # Extract from the ::: to the end of the message (look for null, newline, or non-printable)
-                    end_pos = pos
-                    for i in range(pos, min(len(data), pos + 500)):
-                        byte_val = data[i]
-                        # Stop at null byte or control chars (except common ones)
-                        if byte_val == 0 or (byte_val < 32 and byte_val not in (9, 10, 13)):
-                            end_pos = i
-                            break
-                        end_pos = i + 1
-
-                    output_bytes = data[pos:end_pos]
-
-                    if len(output_bytes) < 30:  # Too short, skip
-                        continue
-
-                    h = hashlib.md5(output_bytes).hexdigest()
-                    if h in seen_hashes:
-                        continue
-                    seen_hashes.add(h)
-
-                    try:
-                        output_str = output_bytes.decode('utf-8', errors='ignore')
-                        clean_output = strip_color_codes(output_str)
-                        clean_output = ''.join(c for c in clean_output if c.isprintable() or c in '\n\r\t')
-                        clean_output = clean_output.strip()
-
-                        if len(clean_output) > 20:
-                            found.append({
-                                'addr': hex(start + pos),
-                                'raw': output_str,
-                                'text': clean_output,
-                                'type': 'trust_message'
-                            })
-                    except UnicodeDecodeError:
-                        pass
-
-                # Look for text with hackmud backtick color codes (e.g. `N for blue)
-                # Pattern: backtick followed by letter/number (color code) followed by text
-                for match in re.finditer(rb'`[A-Za-z0-9][A-Za-z0-9_]+', data):
-                    pos = match.start()
-
-                    # Look backwards to find start of this text block
-                    block_start = pos
-                    for i in range(pos, max(0, pos - 100), -1):
-                        if data[i:i+1] in (b'\x00', b'\n'):
-                            block_start = i + 1
-                            break
-
-                    # Look forward to find end
-                    block_end = pos + 200
-                    for i in range(pos, min(len(data), pos + 2000)):
-                        if data[i:i+1] == b'\x00':
-                            block_end = i
-                            break
-
-                    output_bytes = data[block_start:block_end]
-
-                    # Must have multiple backtick codes to be interesting
-                    if output_bytes.count(b'`') < 3:
-                        continue
-
-                    if len(output_bytes) < 30:
-                        continue
-
-                    h = hashlib.md5(output_bytes).hexdigest()
-                    if h in seen_hashes:
-                        continue
-                    seen_hashes.add(h)
-
-                    try:
-                        output_str = output_bytes.decode('utf-8', errors='ignore')
-                        # Keep backticks in raw, but also make a version showing the color codes
-                        clean_output = ''.join(c for c in output_str if c.isprintable() or c in '\n\r\t')
-                        clean_output = clean_output.strip()
-
-                        if len(clean_output) > 20:
-                            found.append({
-                                'addr': hex(start + block_start),
-                                'raw': output_str,
-                                'text': clean_output,
-                                'type': 'backtick_colored'
-                            })
-                    except UnicodeDecodeError:
-                        pass
-
-            except (OSError, IOError):
+            found.append({
+                'addr': hex(start + pos),
+                'json': json_str,
+                'parsed': parsed,
+                'type': 'json'
+            })
+
+    # Scan for plain text patterns (error messages, etc.)
+    for match in _matches(TEXT_PATTERNS_RE, data, lo, hi):
+        pos = match.start()
+        text_bytes = extract_text_line(data, pos)
+
+        if text_bytes and len(text_bytes) > 10:
+            # Hash to avoid duplicates
+            h = hashlib.md5(text_bytes).hexdigest()
+            if h in seen_hashes:
                 continue
-
-    return found
+            seen_hashes.add(h)
+
+            text_str = text_bytes.decode('utf-8', errors='ignore')
+            # Only include if it looks like a real message
+            if text_str.startswith(':::') and len(text_str) > 20:
+                found.append({
+                    'addr': hex(start + pos),
+                    'text': text_str,
+                    'parsed': {'message': text_str},
+                    'type': 'text'
+                })
 
 def scan_memory_for_json(pid, regions, seen_hashes):
     """Scan memory regions for JSON-like content and text messages"""
     found = []
 
-    # Patterns for hackmud server responses
-    json_patterns = [
-        rb'"t":\d+,"script_name":"',  # Script response with timestamp
-        rb'\{"ok":',           # Standard API response
-        rb'\{"chats":',        # Chat messages
-        rb'\{"users":',        # User data
-        rb'\{"scripts":',      # Script listings
-        rb'\{"balance":',      # GC balance
-        rb'\{"hardline":',     # Hardline data
-        rb'\{"loc":',          # Location data
-        rb'\{"channels":',     # Channel data
-        rb'\{"msg":',          # Messages
-        rb'\{"sys":',          # System messages
-    ]
-
-    # Plain text patterns for error/system messages
-    text_patterns = [
-        rb':::TRUST COMMUNICATION:::',  # System/error messages
-    ]
-
-    combined_json_pattern = rb'|'.join(json_patterns)
-    combined_text_pattern = rb'|'.join(text_patterns)
-
-    mem_file = f'/proc/{pid}/mem'
-
-    with open(mem_file, 'rb') as mem:
-        for start, end in regions:
-            size = end - start
-            if size > 100 * 1024 * 1024:  # Skip regions > 100MB
-                continue
-            try:
-                mem.seek(start)
-                data = mem.read(size)
-
-                # Scan for JSON patterns
-                for match in re.finditer(combined_json_pattern, data):
-                    pos = match.start()
-
-                    # For patterns that don't start with {, find the opening brace
-                    if data[pos:pos+1] != b'{':
-                        # Search backwards for the opening brace
-                        for i in range(pos, max(0, pos - 500), -1):
-                            if data[i:i+1] == b'{':
-                                pos = i
-                                break
-
-                    json_bytes = extract_json(data, pos)
-
-                    if json_bytes and len(json_bytes) > 30:
-                        # Hash to avoid duplicates
-                        h = hashlib.md5(json_bytes).hexdigest()
-                        if h in seen_hashes:
-                            continue
-                        seen_hashes.add(h)
-
-                        try:
-                            json_str = json_bytes.decode('utf-8', errors='ignore')
-                            # Validate it's actual JSON
-                            parsed = json.loads(json_str)
-
-                            # Skip Unity analytics
-                            if isinstance(parsed, dict):
-                                if parsed.get('type', '').startswith('analytics.'):
-                                    continue
-                                if parsed.get('type', '').startswith('perf.'):
-                                    continue
-
-                            found.append({
-                                'addr': hex(start + pos),
-                                'json': json_str,
-                                'parsed': parsed,
-                                'type': 'json'
-                            })
-                        except (json.JSONDecodeError, UnicodeDecodeError):
-                            pass
-
-                # Scan for plain text patterns (error messages, etc.)
-                for match in re.finditer(combined_text_pattern, data):
-                    pos = match.start()
-                    text_bytes = extract_text_line(data, pos)
-
-                    if text_bytes and len(text_bytes) > 10:
-                        # Hash to avoid duplicates
-                        h = hashlib.md5(text_bytes).hexdigest()
-                        if h in seen_hashes:
-                            continue
-                        seen_hashes.add(h)
-
-                        try:
-                            text_str = text_bytes.decode('utf-8', errors='ignore')
-                            # Only include if it looks like a real message
-                            if text_str.startswith(':::') and len(text_str) > 20:
-                                found.append({
-                                    'addr': hex(start + pos),
-                                    'text': text_str,
-                                    'parsed': {'message': text_str},
-                                    'type': 'text'
-                                })
-                        except UnicodeDecodeError:
-                            pass
-
-            except (OSError, IOError):
-                continue
+    for region_start, start, data, lo, hi in read_windows(pid, regions):
+        scan_data_for_json(data, start, seen_hashes, found, lo, hi)
 
     return found
 
+class SeenHashes:
+    """Set of already-reported content hashes, bounded with LRU eviction.
+
+    Every pass re-checks the hashes of everything still in memory, which
+    keeps them fresh, so only content the game has since dropped ages out.
+    Hashes touched in the current pass (see new_pass) are never evicted:
+    dropping one would get its content reported again on the next pass.
+    """
+
+    def __init__(self, maxlen=MAX_SEEN_HASHES):
+        self.maxlen = maxlen
+        self._hashes = OrderedDict()  # hash -> pass it was last touched in
+        self._pass = 0
+        self._warned = False
+
+    def new_pass(self):
+        """Start a new scan pass"""
+        self._pass += 1
+
+    def __contains__(self, h):
+        if h in self._hashes:
+            self._hashes[h] = self._pass
+            self._hashes.move_to_end(h)
+            return True
+        return False
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def add(self, h):
+        self._hashes[h] = self._pass
+        self._hashes.move_to_end(h)
+        while len(self._hashes) > self.maxlen:
+            oldest = next(iter(self._hashes.values()))
+            if oldest == self._pass:
+                # Everything left was seen this pass - keep it all
+                if not self._warned:
+                    print(f"Warning: more than {self.maxlen} distinct items in memory, "
+                          f"seen-hash set growing past MAX_SEEN_HASHES")
+                    self._warned = True
+                break
+            self._hashes.popitem(last=False)
+
+def scan_memory(pid, maps, seen_hashes):
+    """Scan for JSON responses (anonymous regions) and game output (all rw regions)
+    reading each region only once.
+
+    Returns:
+        tuple: (json_results, game_output_results)
+    """
+    anon_runs = populated_runs(pid, get_memory_regions(pid, maps=maps))
+    # Anonymous regions are only read where pages are populated; file-backed
+    # ones are read whole, as their untouched pages still hold file contents
+    regions = []
+    anon_starts = set()
+    run_region = {}  # Run start -> start of the region it was split from
+    for region in get_memory_regions(pid, include_all_rw=True, maps=maps):
+        runs = anon_runs.get(region)
+        if runs is None:
+            regions.append(region)
+        else:
+            regions.extend(runs)
+            anon_starts.update(start for start, end in runs)
+            run_region.update((start, region[0]) for start, end in runs)
+
+    json_found = []
+    game_found = []
+    # Search terms gate game output per region, not per run or window
+    game_gate = GameOutputGate(pid, seen_hashes, game_found)
+    for region_start, start, data, lo, hi in read_windows(pid, regions):
+        if region_start in anon_starts:
+            scan_data_for_json(data, start, seen_hashes, json_found, lo, hi)
+        game_gate.scan(run_region.get(region_start, region_start), data, start, lo, hi)
+
+    return json_found, game_found
+
 def main():
     watch_mode = '--watch' in sys.argv or '-w' in sys.argv
 
@@ -481,12 +956,13 @@ def main():
 
     print(f"Found hackmud process: PID {pid}")
 
-    seen_hashes = set()
+    seen_hashes = SeenHashes()
 
     if watch_mode:
         print(f"Watching for new responses... (writing to {OUTPUT_FILE})")
         print("Press Ctrl+C to stop\n")
 
+        interval = WATCH_INTERVAL
         while True:
             try:
                 # Check if process still exists
@@ -494,17 +970,19 @@ def main():
                     print("Hackmud process ended.")
                     break
 
-                # Scan for JSON responses
-                regions = get_memory_regions(pid)
-                results = scan_memory_for_json(pid, regions, seen_hashes)
+                # Parse the maps file once per pass for both region lists
+                maps = read_maps(pid)
+                seen_hashes.new_pass()
 
-                # Also scan for game output (color-coded text)
-                all_regions = get_memory_regions(pid, include_all_rw=True)
-                game_results = scan_memory_for_game_output(pid, all_regions, seen_hashes)
+                # Scan for JSON responses and game output (color-coded text),
+                # reading each region once for both
+                results, game_results = scan_memory(pid, maps, seen_hashes)
                 results.extend(game_results)
 
+                # One timestamp per pass - every result here came from the same scan
+                timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
+                log_entries = []
                 for r in results:
-                    timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
                     msg_type = r.get('type', 'json')
                     print(f"[{timestamp}] New {msg_type} response at {r['addr']}:")
 
@@ -526,39 +1004,35 @@ def main():
                         if 'terminated' in trust_text.lower() or 'error' in trust_text.lower():
                             save_to_inbox(f"SCRIPT ERROR: {trust_text}", timestamp)
 
-                    # Append to file
+                    log_entries.append(format_log_entry(r, timestamp))
+
+                # Append the whole batch to the log with a single open/write
+                if log_entries:
+                    rotate_log(OUTPUT_FILE)
                     with open(OUTPUT_FILE, 'a') as f:
-                        f.write(f"\n--- {timestamp} [{r['addr']}] [{msg_type}] ---\n")
-                        if msg_type in ('game_output', 'trust_message', 'text', 'backtick_colored'):
-                            # Write raw output first (preserves color codes), then cleaned text
-                            raw_output = r.get('raw', '')
-                            if raw_output and raw_output != r.get('text', ''):
-                                f.write("=== RAW (with colors) ===\n")
-                                f.write(raw_output)
-                                f.write("\n=== CLEANED ===\n")
-                            f.write(r.get('text', ''))
-                        else:
-                            f.write(r.get('json', ''))
-                        f.write("\n")
-
-                time.sleep(0.5)  # Scan twice per second
+                        f.write(''.join(log_entries))
+
+                # Poll again soon after activity, back off while idle
+                if results:
+                    interval = WATCH_INTERVAL
+                else:
+                    interval = min(interval * 2, WATCH_MAX_INTERVAL)
+                time.sleep(interval)
 
             except KeyboardInterrupt:
                 print("\nStopped.")
                 break
     else:
-        regions = get_memory_regions(pid)
+        maps = read_maps(pid)
+        regions = get_memory_regions(pid, maps=maps)
         print(f"Found {len(regions)} anonymous memory regions to scan")
 
         # Also get all rw regions for game output
-        all_regions = get_memory_regions(pid, include_all_rw=True)
+        all_regions = get_memory_regions(pid, include_all_rw=True, maps=maps)
         print(f"Found {len(all_regions)} total rw regions to scan for game output")
 
-        print("\nScanning for JSON responses...")
-        results = scan_memory_for_json(pid, regions, seen_hashes)
-
-        print("Scanning for game output...")
-        game_results = scan_memory_for_game_output(pid, all_regions, seen_hashes)
+        print("\nScanning for JSON responses and game output...")
+        results, game_results = scan_memory(pid, maps, seen_hashes)
         results.extend(game_results)
 
         print(f"\nFound {len(results)} responses:\n")
@@ -571,5 +1045,7 @@ def main():
                 print(json.dumps(r.get('parsed', {}), indent=2)[:1000])
             print()
 
+    close_proc_files()
+
 if __name__ == '__main__':
     main()
@@ -19,6 +19,10 @@ import re
 import sys
 import os
 import time
+import multiprocessing
+
+# Only the first 2MB of each candidate region is read and scored
+MAX_REGION_READ = 2 * 1024 * 1024
 
 def get_pid():
     """Find hackmud PID"""
@@ -28,24 +32,38 @@ def get_pid():
                 with open(f'/proc/{pid}/comm', 'r') as f:
                     if 'hackmud' in f.read():
                         return int(pid)
-            except:
+            except (OSError, ValueError):  # Gone, unreadable, or not valid UTF-8
                 pass
     return None
 
+# Unity color tags - matched specifically so >>> prompts survive stripping
+COLOR_OPEN_RE = re.compile(r'<color[^>]*>')
+COLOR_CLOSE_RE = re.compile(r'</color>')
+
 def strip_color_tags(text, keep_colors=False):
     """Remove or keep Unity color tags"""
     if keep_colors:
         return text
     # Remove color tags specifically (don't eat >>> prompts!)
-    text = re.sub(r'<color[^>]*>', '', text)  # Opening color tags
-    text = re.sub(r'</color>', '', text)  # Closing color tags
+    text = COLOR_OPEN_RE.sub('', text)  # Opening color tags
+    text = COLOR_CLOSE_RE.sub('', text)  # Closing color tags
     return text
 
+def open_maps(pid):
+    """Open the maps file of pid's main thread (cheaper than /proc/[pid]/maps
+    on older kernels, which walk every thread to annotate stacks there)"""
+    try:
+        return open(f'/proc/{pid}/task/{pid}/maps', 'rb')
+    except FileNotFoundError:
+        return open(f'/proc/{pid}/maps', 'rb')
+
 def get_memory_regions(pid):
     """Get all rw-p anonymous regions (heap allocations)"""
     regions = []
-    with open(f'/proc/{pid}/maps', 'r') as f:
-        for line in f:
+    with open_maps(pid) as f:
+        # One read of the raw bytes, not a decoded line at a time
+        lines = f.read().decode(errors='replace').splitlines()
+        for line in lines:
             parts = line.split()
             # Look for rw-p (read-write private) anonymous regions
             if len(parts) >= 2 and 'rw-p' in parts[1]:
@@ -61,6 +79,12 @@ def get_memory_regions(pid):
                         regions.append((start, end, size, path))
     return regions
 
+# Patterns score_region counts
+PROMPT_TEXT_RE = re.compile(r'>>>(.{5,100})')  # >>> prompt and what follows it
+LETTERS3_RE = re.compile(r'[a-z]{3,}')
+COLOR_TAG_RE = re.compile(r'<color=#[A-Fa-f0-9]{6,8}>')
+CHAT_TIMESTAMP_RE = re.compile(r'(\d{4})\s+[\w-]+\s+[\w-]+\s*:::')  # timestamp channel user :::
+
 def score_region(data, debug=False):
     """Score a memory region for shell content likelihood.
 
@@ -72,32 +96,28 @@ def score_region(data, debug=False):
     - recency: estimated recency (based on timestamp analysis)
     - clean_prompts: count of prompts that produce clean text
     """
-    try:
-        decoded = data.decode('utf-16-le', errors='ignore')
-    except:
-        return {'score': 0, 'prompts': 0, 'colors': 0, 'chats': 0, 'recency': 0, 'clean_prompts': 0}
+    # str() rather than .decode() so data can be any buffer (e.g. a memoryview)
+    decoded = str(data, 'utf-16-le', 'ignore')
 
     # Count shell prompts
-    prompts = len(re.findall(r'>>>', decoded))
+    prompts = decoded.count('>>>')
 
     # Count CLEAN prompts (prompts that produce readable text after stripping)
     clean_prompts = 0
-    stripped = re.sub(r'<color[^>]*>', '', decoded)
-    stripped = re.sub(r'</color>', '', stripped)
-    for m in re.finditer(r'>>>(.{5,100})', stripped):
+    stripped = strip_color_tags(decoded)
+    for m in PROMPT_TEXT_RE.finditer(stripped):
         cmd = ''.join(c for c in m.group(1) if 32 <= ord(c) <= 126)
-        if len(cmd.strip()) > 5 and re.search(r'[a-z]{3,}', cmd):
+        if len(cmd.strip()) > 5 and LETTERS3_RE.search(cmd):
             clean_prompts += 1
 
     # Count Unity color tags
-    colors = len(re.findall(r'<color=#[A-Fa-f0-9]{6,8}>', decoded))
+    colors = len(COLOR_TAG_RE.findall(decoded))
 
-    # Count chat format entries (timestamp channel user :::msg:::)
-    chats = len(re.findall(r'\d{4}\s+[\w-]+\s+[\w-]+\s*:::', decoded))
+    # Count chat format entries (timestamp channel user :::msg:::), keeping
+    # their timestamps - Hackmud uses HHMM format - to estimate recency
+    timestamps = CHAT_TIMESTAMP_RE.findall(decoded)
+    chats = len(timestamps)
 
-    # Look for timestamps and estimate recency
-    # Hackmud uses HHMM format timestamps
-    timestamps = re.findall(r'(\d{4})\s+[\w-]+\s+[\w-]+\s*:::', decoded)
     recency = 0
     if timestamps:
         # Get current time in HHMM
@@ -132,6 +152,58 @@ def score_region(data, debug=False):
         'recency': recency
     }
 
+# /proc/[pid]/mem handle (opened by the parent, inherited by pool workers)
+# and read buffer of the current scoring process, reused for every region
+# that process scores
+_worker_mem = None
+_worker_buf = None
+
+def _init_worker_buf():
+    """Pool initializer: allocate the read buffer once per worker"""
+    global _worker_buf
+    if _worker_buf is None:
+        _worker_buf = memoryview(bytearray(MAX_REGION_READ))
+
+def _score_region_at(task):
+    """Read and score one region. Returns (scores, error) - only the small
+    scores dict goes back to the parent, never the region data."""
+    start, size = task
+    view = _worker_buf[:min(size, MAX_REGION_READ)]
+    try:
+        n = os.preadv(_worker_mem.fileno(), [view], start)
+    except OSError as e:
+        return None, str(e)
+    return score_region(view[:n]), None
+
+def score_regions(pid, regions):
+    """Score every region, spreading the (CPU-bound) regex work across processes.
+
+    Uses the fork context so workers inherit everything they need, including
+    the /proc/[pid]/mem handle; tasks are just (start, size) pairs. Results
+    come back in region order.
+
+    Raises:
+        OSError: If /proc/[pid]/mem cannot be opened
+    """
+    global _worker_mem
+    tasks = [(start, size) for start, end, size, path in regions]
+    workers = min(os.cpu_count() or 1, len(tasks))
+
+    # Open before starting the pool: a pool whose initializer raises keeps
+    # restarting workers forever instead of failing
+    _worker_mem = open(f'/proc/{pid}/mem', 'rb', buffering=0)
+    try:
+        if workers > 1:
+            ctx = multiprocessing.get_context('fork')
+            with ctx.Pool(workers, initializer=_init_worker_buf) as pool:
+                return pool.map(_score_region_at, tasks, chunksize=4)
+
+        _init_worker_buf()
+        return [_score_region_at(task) for task in tasks]
+    finally:
+        _worker_mem.close()
+        _worker_mem = None
+
 def find_live_buffer(pid, debug=False):
     """Find the live terminal buffer dynamically.
 
@@ -149,30 +221,25 @@ def find_live_buffer(pid, debug=False):
 
     candidates = []
 
-    with open(f'/proc/{pid}/mem', 'rb') as mem:
-        for start, end, size, path in regions:
-            try:
-                mem.seek(start)
-                data = mem.read(min(size, 2 * 1024 * 1024))  # Read up to 2MB
-                scores = score_region(data, debug)
-
-                if scores['score'] > 10:  # Minimum threshold
-                    candidates.append({
-                        'start': start,
-                        'end': end,
-                        'size': size,
-                        'path': path,
-                        'data': data,
-                        **scores
-                    })
-
-                    if debug:
-                        print(f"  0x{start:x}: score={scores['score']:.1f} "
-                              f"(prompts={scores['prompts']}, colors={scores['colors']}, "
-                              f"chats={scores['chats']}, recency={scores['recency']})")
-            except Exception as e:
-                if debug:
-                    print(f"  Error reading 0x{start:x}: {e}")
+    for (start, end, size, path), (scores, error) in zip(regions, score_regions(pid, regions)):
+        if error is not None:
+            if debug:
+                print(f"  Error reading 0x{start:x}: {error}")
+            continue
+
+        if scores['score'] > 10:  # Minimum threshold
+            candidates.append({
+                'start': start,
+                'end': end,
+                'size': size,
+                'path': path,
+                **scores
+            })
+
+            if debug:
+                print(f"  0x{start:x}: score={scores['score']:.1f} "
+                      f"(prompts={scores['prompts']}, colors={scores['colors']}, "
+                      f"chats={scores['chats']}, recency={scores['recency']})")
 
     if not candidates:
         raise RuntimeError("No suitable memory regions found. Is hackmud running with an active terminal?")
@@ -196,36 +263,76 @@ def find_live_buffer(pid, debug=False):
                     print(f"  0x{c['start']:x}: recency={c['recency']}, chats={c['chats']}, score={c['score']:.1f}")
             candidates = ambiguous + [c for c in candidates if c['score'] < top_score * 0.8]
 
-    best = candidates[0]
+    # Workers only returned scores, so fetch the winning region's data here,
+    # moving on to the next candidate if it has become unreadable since
+    with open(f'/proc/{pid}/mem', 'rb', buffering=0) as mem:
+        for best in candidates:
+            try:
+                data = os.pread(mem.fileno(), min(best['size'], MAX_REGION_READ), best['start'])
+            except OSError as e:
+                error = e
+            else:
+                if data:
+                    break
+                error = "region is empty"
+            print(f"Warning: region 0x{best['start']:x} (score={best['score']:.1f}) "
+                  f"became unreadable after scoring: {error}")
+        else:
+            raise RuntimeError("No suitable memory regions found. Is hackmud running with an active terminal?")
+
+    if best is not candidates[0]:
+        print(f"Warning: falling back to lower-ranked region 0x{best['start']:x} (score={best['score']:.1f})")
 
     if debug:
         print(f"\nSelected live buffer: 0x{best['start']:x}-0x{best['end']:x} "
               f"({best['size']//1024}KB) score={best['score']:.1f}")
 
-    return best['start'], best['end'], best['data']
+    return best['start'], best['end'], data
+
+# Nordic/accented letters allowed alongside ASCII in chat text
+ACCENTED_CHARS = 'åäöøæÅÄÖØÆéèêëàáâãñíìîïóòôõúùûüç'
+# Anything but ASCII printables, newlines/tabs and accented letters
+UNCLEAN_CHAR_RE = re.compile('[^\x20-\x7f\n\r\t' + ACCENTED_CHARS + ']')
+# Anything but ASCII and accented letters
+NON_ASCII_CHAR_RE = re.compile('[^\x00-\x7f' + ACCENTED_CHARS + ']')
 
 def is_clean_text(text):
     """Check if text contains only ASCII and common chars (no garbage unicode)"""
-    for c in text:
-        # Allow ASCII printables, common punctuation, and newlines
-        if ord(c) > 127 or (ord(c) < 32 and c not in '\n\r\t'):
-            if c not in 'åäöøæÅÄÖØÆéèêëàáâãñíìîïóòôõúùûüç':  # Allow Nordic/accented
-                return False
-    return True
+    return UNCLEAN_CHAR_RE.search(text) is None
 
 def clean_text(text):
     """Remove garbage unicode characters, keep only ASCII + allowed chars"""
-    allowed = set('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
-                  ' .,!?;:\'"-_@#$%^&*()[]{}|/\\<>=+`~\n\r\t')
-    allowed.update('åäöøæÅÄÖØÆéèêëàáâãñíìîïóòôõúùûüç')
-    result = []
-    for c in text:
-        if c in allowed:
-            result.append(c)
-        elif ord(c) < 128:  # Other ASCII
-            result.append(c)
-        # Skip non-ASCII garbage
-    return ''.join(result)
+    return NON_ASCII_CHAR_RE.sub('', text)
+
+# Script responses worth reporting (money transfers, lock results, system
+# messages). Kept as separate patterns, matched in this order: they may
+# overlap, and the output lists each type's hits together.
+RESPONSE_PATTERNS = [(re.compile(pattern, re.IGNORECASE), ptype) for pattern, ptype in [
+    (r'Received\s+[\d,KMB]+GC\s+from\s+[\w_]+', 'MONEY'),
+    (r'Connection Terminated', 'BREACH'),
+    (r'LOCK_UNLOCKED\s*\w*', 'LOCK'),
+    (r'LOCK_ERROR[^:]*', 'LOCK'),
+    (r'Denied access by[^.]+', 'LOCK'),
+    (r'is not the correct\s+\w+', 'LOCK'),
+    (r'System slots are full', 'SYSTEM'),
+    (r'Upgrade transfer failed', 'SYSTEM'),
+    (r'hardline required', 'HARDLINE'),
+    (r'(\d{1,3}[KMB]\d{0,3}GC|balance[^<]*\d+[KMB]?\d*GC)', 'BALANCE'),
+    (r'Msg Sent', 'MSG'),
+    (r'Failure', 'FAIL'),
+]]
+
+# Patterns read_live extracts commands, chats and script output with
+COMMAND_RE = re.compile(r'>>(\w+)[.:](\w+(?:\.\w+)?(?:\{[^}]*\})?)')  # >>user.script{args}
+LETTERS2_RE = re.compile(r'[a-z]{2,}')
+CHAT_RE = re.compile(r'(\d{4})\s+([\w-]+)\s+([\w-]+)\s*:::(.*?):::')  # timestamp channel user :::msg:::
+WHITESPACE_RUN_RE = re.compile(r'\s{3,}')
+COMMAND_OUTPUT_RE = re.compile(r'>>(\w+[\w._]*(?:\{[^}]*\})?)\s*\n([\s\S]*?)(?=>>|\Z)')  # command, its output
+SCRIPT_NAME_RE = re.compile(r'\w+\.\w+')
+COLOR_TAG_REMNANT_RE = re.compile(r'</?color[^>]*>')
+HEX_COLOR_RE = re.compile(r'#[A-Fa-f0-9]{6,8}')
+SPACE_RUN_RE = re.compile(r'[ \t]{4,}')
+BLANK_LINES_RE = re.compile(r'\n{3,}')
 
 def read_live(num_lines=20, keep_colors=False, debug=False):
     """Read live shell output from dynamically detected buffer region"""
@@ -244,12 +351,8 @@ def read_live(num_lines=20, keep_colors=False, debug=False):
         print(f"Error: {e}")
         return
 
-    # Decode as UTF-16
-    try:
-        decoded = data.decode('utf-16-le', errors='ignore')
-    except:
-        print("Decode error")
-        return
+    # Decode as UTF-16 (errors='ignore' never raises)
+    decoded = data.decode('utf-16-le', errors='ignore')
 
     # Optionally strip color tags
     clean = strip_color_tags(decoded, keep_colors)
@@ -258,22 +361,20 @@ def read_live(num_lines=20, keep_colors=False, debug=False):
     # Pattern: >>username.command{args} or >>username:command
     commands = []
     # Match known users or generic username pattern
-    cmd_pattern = re.compile(r'>>(\w+)[.:](\w+(?:\.\w+)?(?:\{[^}]*\})?)')
-    for match in cmd_pattern.finditer(clean):
+    for match in COMMAND_RE.finditer(clean):
         user = match.group(1)
         cmd = match.group(2)
         # Clean to ASCII only
         cmd = ''.join(c for c in cmd if 32 <= ord(c) <= 126)
         cmd = cmd.strip()
         # Only add if has meaningful command content
-        if len(cmd) > 2 and re.search(r'[a-z]{2,}', cmd):
+        if len(cmd) > 2 and LETTERS2_RE.search(cmd):
             commands.append(f"{user}.{cmd}")
 
     # Find chat-formatted entries (timestamp channel user :::message:::)
-    chat_pattern = re.compile(r'(\d{4})\s+([\w-]+)\s+([\w-]+)\s*:::(.*?):::')
     chats = []
     seen = set()
-    for match in chat_pattern.finditer(clean):
+    for match in CHAT_RE.finditer(clean):
         ts = match.group(1)
         channel = match.group(2)
         user = match.group(3)
@@ -284,7 +385,7 @@ def read_live(num_lines=20, keep_colors=False, debug=False):
             continue
 
         # Remove excessive whitespace
-        msg = re.sub(r'\s{3,}', ' ', msg)
+        msg = WHITESPACE_RUN_RE.sub(' ', msg)
 
         entry = f"[{ts}] {channel} {user}: {msg}"
 
@@ -299,22 +400,8 @@ def read_live(num_lines=20, keep_colors=False, debug=False):
 
     # Find script responses (money transfers, lock results, system messages)
     responses = []
-    response_patterns = [
-        (r'Received\s+[\d,KMB]+GC\s+from\s+[\w_]+', 'MONEY'),
-        (r'Connection Terminated', 'BREACH'),
-        (r'LOCK_UNLOCKED\s*\w*', 'LOCK'),
-        (r'LOCK_ERROR[^:]*', 'LOCK'),
-        (r'Denied access by[^.]+', 'LOCK'),
-        (r'is not the correct\s+\w+', 'LOCK'),
-        (r'System slots are full', 'SYSTEM'),
-        (r'Upgrade transfer failed', 'SYSTEM'),
-        (r'hardline required', 'HARDLINE'),
-        (r'(\d{1,3}[KMB]\d{0,3}GC|balance[^<]*\d+[KMB]?\d*GC)', 'BALANCE'),
-        (r'Msg Sent', 'MSG'),
-        (r'Failure', 'FAIL'),
-    ]
-    for pattern, ptype in response_patterns:
-        for match in re.finditer(pattern, clean, re.IGNORECASE):
+    for pattern, ptype in RESPONSE_PATTERNS:
+        for match in pattern.finditer(clean):
             msg = clean_text(match.group(0)[:150])
             if msg and len(msg) > 3:
                 responses.append(f"[{ptype}] {msg}")
@@ -323,8 +410,7 @@ def read_live(num_lines=20, keep_colors=False, debug=False):
     script_outputs = []
 
     # Find all >> command positions and extract what follows
-    cmd_pattern = re.compile(r'>>(\w+[\w._]*(?:\{[^}]*\})?)\s*\n([\s\S]*?)(?=>>|\Z)')
-    for match in cmd_pattern.finditer(clean):
+    for match in COMMAND_OUTPUT_RE.finditer(clean):
         cmd = match.group(1).strip()
         response = match.group(2).strip()
 
@@ -333,17 +419,17 @@ def read_live(num_lines=20, keep_colors=False, debug=False):
         cmd = cmd[:120]
 
         # Skip if no meaningful command (needs user.script pattern)
-        if len(cmd) < 5 or not re.search(r'\w+\.\w+', cmd):
+        if len(cmd) < 5 or not SCRIPT_NAME_RE.search(cmd):
             continue
 
         # Clean the response - keep printable chars and newlines
         response = ''.join(c for c in response if 32 <= ord(c) <= 126 or c == '\n')
         # Remove color tag remnants
-        response = re.sub(r'</?color[^>]*>', '', response)
-        response = re.sub(r'#[A-Fa-f0-9]{6,8}', '', response)
+        response = COLOR_TAG_REMNANT_RE.sub('', response)
+        response = HEX_COLOR_RE.sub('', response)
         # Collapse excessive whitespace but keep structure
-        response = re.sub(r'[ \t]{4,}', ' ', response)
-        response = re.sub(r'\n{3,}', '\n\n', response)
+        response = SPACE_RUN_RE.sub(' ', response)
+        response = BLANK_LINES_RE.sub('\n\n', response)
 
         # Take first 600 chars of response
         response = response[:600].strip()
@@ -17,7 +17,7 @@ def find_hackmud_window():
         windows = result.stdout.strip().split('\n')
         if windows and windows[0]:
             return windows[0]
-    except Exception as e:
+    except OSError as e:
         print(f"Error finding window: {e}")
     return None
 